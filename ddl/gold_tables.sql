@@ -1,32 +1,60 @@
+-- Gold tables for a single snapshot date. Run with:
+--   psql -v as_of_date=YYYY-MM-DD -f gold_tables.sql
+-- scripts/build_gold.py builds the same tables for batches of dates.
+
+CREATE SCHEMA IF NOT EXISTS gold;
+
 -- 1
 CREATE TABLE IF NOT EXISTS gold.orders_summary AS
-WITH order_level AS (
+WITH snapshots AS (
+    SELECT UNNEST(ARRAY[:'as_of_date']::date[]) AS snapshot_date
+),
+order_items_agg AS (
     SELECT
+        oi."Order_id",
+        COUNT(oi."Order_item_id") AS "items_count",
+        SUM(oi."Price" * oi."Quantity") AS "order_value"
+    FROM silver."order_items" oi
+    GROUP BY oi."Order_id"
+),
+order_level AS (
+    SELECT
+        s.snapshot_date,
         o."Order_id",
         o."Customer_id",
         o."Customer_City",
         o."Payment_mode",
         o."Delivery_status",
-        COUNT(oi."Order_item_id") AS "items_count",
-        SUM(oi."Price" * oi."Quantity") AS "order_value"
+        COALESCE(oia."items_count", 0) AS "items_count",
+        oia."order_value"
     FROM silver."orders" o
-    LEFT JOIN silver."order_items" oi
-           ON o."Order_id" = oi."Order_id"
-    GROUP BY o."Order_id", o."Customer_id", o."Customer_City", o."Payment_mode", o."Delivery_status"
+    JOIN snapshots s
+        ON o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date
+    LEFT JOIN order_items_agg oia
+           ON o."Order_id" = oia."Order_id"
 ),
 city_stats AS (
     -- city-level delivery rate (percent delivered per city)
     SELECT
+        order_level.snapshot_date,
         order_level."Customer_City" AS "Customer_City",
         ROUND(
           100.0 * SUM(CASE WHEN order_level."Delivery_status" = 'Delivered' THEN 1 ELSE 0 END)
           / NULLIF(COUNT(*),0)
         , 2) AS "city_delivery_rate"
     FROM order_level
-    GROUP BY order_level."Customer_City"
+    GROUP BY order_level.snapshot_date, order_level."Customer_City"
+),
+city_reliability AS (
+    SELECT
+        cs.snapshot_date,
+        ROUND(AVG(cs."city_delivery_rate")::numeric, 2) AS "avg_city_reliability_pct"
+    FROM city_stats cs
+    GROUP BY cs.snapshot_date
 ),
 agg AS (
     SELECT
+        order_level.snapshot_date,
         COUNT(DISTINCT order_level."Order_id") AS "total_orders",
 
         -- 1. Basket Size (avg items per order)
@@ -45,53 +73,80 @@ agg AS (
         ROUND(100.0 * SUM(CASE WHEN order_level."Delivery_status" = 'Delivered' THEN 1 ELSE 0 END) / NULLIF(COUNT(*),0), 2) AS "delivery_success_rate_pct",
 
         -- 5. City-wise Delivery Reliability (average across cities)
-        (SELECT ROUND(AVG(cs."city_delivery_rate")::numeric, 2) FROM city_stats cs) AS "avg_city_reliability_pct"
+        cr."avg_city_reliability_pct"
 
     FROM order_level
+    JOIN city_reliability cr
+        ON order_level.snapshot_date = cr.snapshot_date
+    GROUP BY order_level.snapshot_date, cr."avg_city_reliability_pct"
 )
 SELECT * FROM agg;
 
-
--- 2.
-
-CREATE SCHEMA IF NOT EXISTS gold;
-
+-- 2
 CREATE TABLE IF NOT EXISTS gold.menu_performance AS
-WITH item_stats AS (
+WITH snapshots AS (
+    SELECT UNNEST(ARRAY[:'as_of_date']::date[]) AS snapshot_date
+),
+order_item_stats AS (
     SELECT
+        oi."Order_id",
+        o."Order_date"::date AS order_day,
         oi."Menu_item",
         r."cuisine_type" AS "Cuisine",
-        COUNT(DISTINCT o."Order_id") AS total_orders,
-        SUM(oi."Quantity") AS total_quantity_sold,
-        SUM(oi."Quantity" * oi."Price") AS total_revenue
+        SUM(oi."Quantity") AS quantity,
+        SUM(oi."Quantity" * oi."Price") AS revenue
     FROM silver."order_items" oi
     JOIN silver."orders" o
         ON oi."Order_id" = o."Order_id"
     JOIN silver."restaurants" r
         ON o."Restaurant_id" = r."Restaurant_id"
-    GROUP BY oi."Menu_item", r."cuisine_type"
+    GROUP BY oi."Order_id", o."Order_date", oi."Menu_item", r."cuisine_type"
+),
+item_stats AS (
+    SELECT
+        s.snapshot_date,
+        ois."Menu_item",
+        ois."Cuisine",
+        COUNT(DISTINCT ois."Order_id") AS total_orders,
+        SUM(ois.quantity)::bigint AS total_quantity_sold,
+        SUM(ois.revenue) AS total_revenue
+    FROM order_item_stats ois
+    JOIN snapshots s
+        ON ois.order_day IS NULL OR ois.order_day <= s.snapshot_date
+    GROUP BY s.snapshot_date, ois."Menu_item", ois."Cuisine"
 ),
 cuisine_totals AS (
     SELECT
+        snapshot_date,
         "Cuisine",
         SUM(total_revenue) AS cuisine_total_revenue
     FROM item_stats
-    GROUP BY "Cuisine"
+    GROUP BY snapshot_date, "Cuisine"
+),
+order_totals AS (
+    SELECT
+        s.snapshot_date,
+        COUNT(DISTINCT o."Order_id") AS total_orders
+    FROM silver."orders" o
+    JOIN snapshots s
+        ON o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date
+    GROUP BY s.snapshot_date
 )
 SELECT
+    i.snapshot_date,
     i."Menu_item",
     i."Cuisine",
     i.total_orders,
     i.total_quantity_sold,
     i.total_revenue,
 
-    -- Popularity Index: % of total orders containing this item
+    -- Popularity Index: percent of total orders containing this item
     ROUND(
-        100.0 * i.total_orders / NULLIF((SELECT COUNT(DISTINCT "Order_id") FROM silver."orders"), 0),
+        100.0 * i.total_orders / NULLIF(t.total_orders, 0),
         2
     ) AS popularity_index,
 
-    -- Cuisine Revenue Share: Item’s revenue as % of its cuisine revenue
+    -- Cuisine Revenue Share: Item’s revenue as percent of its cuisine revenue
     ROUND(
         100.0 * i.total_revenue / NULLIF(c.cuisine_total_revenue, 0),
         2
@@ -99,27 +154,45 @@ SELECT
 
 FROM item_stats i
 JOIN cuisine_totals c
-    ON i."Cuisine" = c."Cuisine";
+    ON i.snapshot_date = c.snapshot_date
+   AND i."Cuisine" = c."Cuisine"
+JOIN order_totals t
+    ON i.snapshot_date = t.snapshot_date;
 
 -- 3
-
 CREATE TABLE IF NOT EXISTS gold.customer_summary AS
-WITH base AS (
+WITH snapshots AS (
+    SELECT UNNEST(ARRAY[:'as_of_date']::date[]) AS snapshot_date
+),
+customer_orders AS (
+    SELECT
+        "Customer_id",
+        "Order_date",
+        COUNT("Order_id") AS orders_count
+    FROM silver."orders"
+    GROUP BY "Customer_id", "Order_date"
+),
+base AS (
     SELECT
+        s.snapshot_date,
         c."Customer_id",
         c."city",
         DATE_TRUNC('month', c."Signup_date") AS acquisition_month,
-        MIN(o."Order_date") AS first_order_date,
-        MAX(o."Order_date") AS last_order_date,
-        COUNT(o."Order_id") AS total_orders,
-        EXTRACT(DAY FROM (CURRENT_DATE - MAX(o."Order_date"))) AS days_since_last_order
+        MIN(co."Order_date") AS first_order_date,
+        MAX(co."Order_date") AS last_order_date,
+        COALESCE(SUM(co.orders_count), 0) AS total_orders,
+        EXTRACT(DAY FROM (s.snapshot_date - MAX(co."Order_date"))) AS days_since_last_order
     FROM silver."customers" c
-    LEFT JOIN silver."orders" o
-        ON c."Customer_id" = o."Customer_id"
-    GROUP BY c."Customer_id", c."city", acquisition_month
+    JOIN snapshots s
+        ON c."Signup_date" <= s.snapshot_date
+    LEFT JOIN customer_orders co
+        ON c."Customer_id" = co."Customer_id"
+       AND (co."Order_date" IS NULL OR co."Order_date"::date <= s.snapshot_date)
+    GROUP BY s.snapshot_date, c."Customer_id", c."city", acquisition_month
 ),
 monthly AS (
     SELECT
+        snapshot_date,
         acquisition_month,
         "city",
         COUNT(DISTINCT "Customer_id") AS new_customers,
@@ -128,12 +201,13 @@ monthly AS (
         COUNT(*) FILTER (WHERE days_since_last_order <= 30) AS active_customers,
         ROUND(AVG(EXTRACT(DAY FROM (last_order_date - first_order_date))), 2) AS avg_first_to_last_order_lag
     FROM base
-    GROUP BY acquisition_month, "city"
+    GROUP BY snapshot_date, acquisition_month, "city"
 )
 SELECT
+    snapshot_date,
     acquisition_month,
     "city",
-    SUM(new_customers) OVER (PARTITION BY "city" ORDER BY acquisition_month ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS total_customers,  -- cumulative
+    SUM(new_customers) OVER (PARTITION BY snapshot_date, "city" ORDER BY acquisition_month ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS total_customers,  -- cumulative
     new_customers,
     retention_rate_pct,
     dormant_customer_pct,
@@ -141,41 +215,57 @@ SELECT
     avg_first_to_last_order_lag
 FROM monthly;
 
-
-
 -- 4
 CREATE TABLE IF NOT EXISTS gold.restaurant_summary AS
-WITH base AS (
+WITH snapshots AS (
+    SELECT UNNEST(ARRAY[:'as_of_date']::date[]) AS snapshot_date
+),
+order_revenue AS (
+    SELECT
+        o."Order_id",
+        o."Restaurant_id",
+        o."Order_date"::date AS order_day,
+        SUM(oi."Quantity" * oi."Price") AS revenue
+    FROM silver."orders" o
+    LEFT JOIN silver."order_items" oi
+        ON o."Order_id" = oi."Order_id"
+    GROUP BY o."Order_id", o."Restaurant_id", o."Order_date"
+),
+base AS (
     SELECT
+        s.snapshot_date,
         r."Restaurant_id",
         r."city",
         DATE_TRUNC('month', r."Open_date") AS opening_month,
-        COUNT(DISTINCT o."Order_id") AS total_orders,
+        COUNT(DISTINCT rev."Order_id") AS total_orders,
         ROUND(AVG(r."Rating"),2) AS avg_rating,
-        SUM(oi."Quantity" * oi."Price") AS total_revenue
+        SUM(rev.revenue) AS total_revenue
     FROM silver."restaurants" r
-    LEFT JOIN silver."orders" o
-        ON r."Restaurant_id" = o."Restaurant_id"
-    LEFT JOIN silver."order_items" oi
-        ON o."Order_id" = oi."Order_id"
-    GROUP BY r."Restaurant_id", r."city", opening_month
+    JOIN snapshots s
+        ON r."Open_date" <= s.snapshot_date
+    LEFT JOIN order_revenue rev
+        ON r."Restaurant_id" = rev."Restaurant_id"
+       AND (rev.order_day IS NULL OR rev.order_day <= s.snapshot_date)
+    GROUP BY s.snapshot_date, r."Restaurant_id", r."city", opening_month
 ),
 monthly AS (
     SELECT
+        snapshot_date,
         opening_month,
         "city",
         COUNT(DISTINCT "Restaurant_id") AS new_restaurants,
         SUM(COALESCE(total_revenue,0) * COALESCE(avg_rating,0)) AS performance_score
     FROM base
-    GROUP BY opening_month, "city"
+    GROUP BY snapshot_date, opening_month, "city"
 ),
 cumulative AS (
     SELECT
+        m.snapshot_date,
         m.opening_month,
         m."city",
         m.new_restaurants,
         SUM(m.new_restaurants) OVER (
-            PARTITION BY m."city"
+            PARTITION BY m.snapshot_date, m."city"
             ORDER BY m.opening_month
             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
         ) AS total_restaurants,
@@ -184,46 +274,55 @@ cumulative AS (
 )
 SELECT * FROM cumulative;
 
-
 -- 5
-
 CREATE TABLE IF NOT EXISTS gold.partner_summary AS
-WITH base AS (
+WITH snapshots AS (
+    SELECT UNNEST(ARRAY[:'as_of_date']::date[]) AS snapshot_date
+),
+base AS (
     SELECT
+        s.snapshot_date,
         p."Partner_id",
         p."Vehicle_type",
         p."Join_date",
         COUNT(DISTINCT o."Order_id") AS orders_delivered,
         ROUND(AVG(p."Rating"),2) AS avg_rating
     FROM silver."delivery_partners" p
+    JOIN snapshots s
+        ON p."Join_date" IS NULL OR p."Join_date" <= s.snapshot_date
     LEFT JOIN silver."orders" o
         ON p."Partner_id" = o."Partner_id"
-    GROUP BY p."Partner_id", p."Vehicle_type", p."Join_date"
+       AND (o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date)
+    GROUP BY s.snapshot_date, p."Partner_id", p."Vehicle_type", p."Join_date"
 ),
 
 vehicle_level AS (
     SELECT
+        snapshot_date,
         "Vehicle_type",
         COUNT(DISTINCT "Partner_id") AS total_partners,
         ROUND(AVG(orders_delivered),2) AS avg_orders_per_partner,
         ROUND(AVG(avg_rating),2) AS avg_partner_rating,
-        ROUND(100.0 * COUNT(*) FILTER (WHERE CURRENT_DATE - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate
+        ROUND(100.0 * COUNT(*) FILTER (WHERE snapshot_date - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate
     FROM base
-    GROUP BY "Vehicle_type"
+    GROUP BY snapshot_date, "Vehicle_type"
 ),
 
 overall AS (
     SELECT
+        snapshot_date,
         COUNT(DISTINCT "Partner_id") AS total_partners,
         ROUND(AVG(orders_delivered),2) AS avg_orders_per_partner,
         ROUND(AVG(avg_rating),2) AS avg_partner_rating_overall,
-        ROUND(100.0 * COUNT(*) FILTER (WHERE CURRENT_DATE - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate_overall
+        ROUND(100.0 * COUNT(*) FILTER (WHERE snapshot_date - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate_overall
     FROM base
+    GROUP BY snapshot_date
 )
 
 SELECT * FROM vehicle_level
 UNION ALL
 SELECT
+    snapshot_date,
     'ALL' AS "Vehicle_type",
     total_partners,
     avg_orders_per_partner,
@@ -1,5 +1,8 @@
 import psycopg2
 import logging
+import argparse
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # -----------------------------
 # Logging Setup
@@ -11,44 +14,77 @@ logging.basicConfig(
 )
 
 # -----------------------------
-# Build Gold Layer
+# Database Connection
 # -----------------------------
-def build_gold(conn):
-    cur = conn.cursor()
-    try:
-        logging.info("Creating Gold tables...")
+def get_connection():
+    return psycopg2.connect(
+        dbname='mydb',
+        user='postgres',
+        password='Kalam5017',
+        host='localhost',
+        port='5432'
+    )
 
-        gold_queries = [
-            # 1. Orders Summary
-            """
-            CREATE TABLE IF NOT EXISTS gold.orders_summary AS
-WITH order_level AS (
+# -----------------------------
+# Gold Table Definitions
+# -----------------------------
+# Every query is evaluated for a batch of as-of dates passed in as
+# %(snapshot_dates)s. Silver is scanned once per batch and the rows are
+# fanned out to each snapshot_date, so only data known on that date
+# (orders placed, customers signed up, restaurants opened, partners joined)
+# is counted. Rows with no date at all are counted in every snapshot.
+GOLD_TABLES = {
+    # 1. Orders Summary
+    "orders_summary": """
+WITH snapshots AS (
+    SELECT UNNEST(%(snapshot_dates)s::date[]) AS snapshot_date
+),
+order_items_agg AS (
+    SELECT
+        oi."Order_id",
+        COUNT(oi."Order_item_id") AS "items_count",
+        SUM(oi."Price" * oi."Quantity") AS "order_value"
+    FROM silver."order_items" oi
+    GROUP BY oi."Order_id"
+),
+order_level AS (
     SELECT
+        s.snapshot_date,
         o."Order_id",
         o."Customer_id",
         o."Customer_City",
         o."Payment_mode",
         o."Delivery_status",
-        COUNT(oi."Order_item_id") AS "items_count",
-        SUM(oi."Price" * oi."Quantity") AS "order_value"
+        COALESCE(oia."items_count", 0) AS "items_count",
+        oia."order_value"
     FROM silver."orders" o
-    LEFT JOIN silver."order_items" oi
-           ON o."Order_id" = oi."Order_id"
-    GROUP BY o."Order_id", o."Customer_id", o."Customer_City", o."Payment_mode", o."Delivery_status"
+    JOIN snapshots s
+        ON o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date
+    LEFT JOIN order_items_agg oia
+           ON o."Order_id" = oia."Order_id"
 ),
 city_stats AS (
     -- city-level delivery rate (percent delivered per city)
     SELECT
+        order_level.snapshot_date,
         order_level."Customer_City" AS "Customer_City",
         ROUND(
           100.0 * SUM(CASE WHEN order_level."Delivery_status" = 'Delivered' THEN 1 ELSE 0 END)
           / NULLIF(COUNT(*),0)
         , 2) AS "city_delivery_rate"
     FROM order_level
-    GROUP BY order_level."Customer_City"
+    GROUP BY order_level.snapshot_date, order_level."Customer_City"
+),
+city_reliability AS (
+    SELECT
+        cs.snapshot_date,
+        ROUND(AVG(cs."city_delivery_rate")::numeric, 2) AS "avg_city_reliability_pct"
+    FROM city_stats cs
+    GROUP BY cs.snapshot_date
 ),
 agg AS (
     SELECT
+        order_level.snapshot_date,
         COUNT(DISTINCT order_level."Order_id") AS "total_orders",
 
         -- 1. Basket Size (avg items per order)
@@ -67,51 +103,81 @@ agg AS (
         ROUND(100.0 * SUM(CASE WHEN order_level."Delivery_status" = 'Delivered' THEN 1 ELSE 0 END) / NULLIF(COUNT(*),0), 2) AS "delivery_success_rate_pct",
 
         -- 5. City-wise Delivery Reliability (average across cities)
-        (SELECT ROUND(AVG(cs."city_delivery_rate")::numeric, 2) FROM city_stats cs) AS "avg_city_reliability_pct"
+        cr."avg_city_reliability_pct"
 
     FROM order_level
+    JOIN city_reliability cr
+        ON order_level.snapshot_date = cr.snapshot_date
+    GROUP BY order_level.snapshot_date, cr."avg_city_reliability_pct"
 )
-SELECT * FROM agg;
-            """,
+SELECT * FROM agg
+""",
 
-            # 2. Menu Performance
-            """
-            CREATE TABLE IF NOT EXISTS gold.menu_performance AS
-WITH item_stats AS (
+    # 2. Menu Performance
+    "menu_performance": """
+WITH snapshots AS (
+    SELECT UNNEST(%(snapshot_dates)s::date[]) AS snapshot_date
+),
+order_item_stats AS (
     SELECT
+        oi."Order_id",
+        o."Order_date"::date AS order_day,
         oi."Menu_item",
         r."cuisine_type" AS "Cuisine",
-        COUNT(DISTINCT o."Order_id") AS total_orders,
-        SUM(oi."Quantity") AS total_quantity_sold,
-        SUM(oi."Quantity" * oi."Price") AS total_revenue
+        SUM(oi."Quantity") AS quantity,
+        SUM(oi."Quantity" * oi."Price") AS revenue
     FROM silver."order_items" oi
     JOIN silver."orders" o
         ON oi."Order_id" = o."Order_id"
     JOIN silver."restaurants" r
         ON o."Restaurant_id" = r."Restaurant_id"
-    GROUP BY oi."Menu_item", r."cuisine_type"
+    GROUP BY oi."Order_id", o."Order_date", oi."Menu_item", r."cuisine_type"
+),
+item_stats AS (
+    SELECT
+        s.snapshot_date,
+        ois."Menu_item",
+        ois."Cuisine",
+        COUNT(DISTINCT ois."Order_id") AS total_orders,
+        SUM(ois.quantity)::bigint AS total_quantity_sold,
+        SUM(ois.revenue) AS total_revenue
+    FROM order_item_stats ois
+    JOIN snapshots s
+        ON ois.order_day IS NULL OR ois.order_day <= s.snapshot_date
+    GROUP BY s.snapshot_date, ois."Menu_item", ois."Cuisine"
 ),
 cuisine_totals AS (
     SELECT
+        snapshot_date,
         "Cuisine",
         SUM(total_revenue) AS cuisine_total_revenue
     FROM item_stats
-    GROUP BY "Cuisine"
+    GROUP BY snapshot_date, "Cuisine"
+),
+order_totals AS (
+    SELECT
+        s.snapshot_date,
+        COUNT(DISTINCT o."Order_id") AS total_orders
+    FROM silver."orders" o
+    JOIN snapshots s
+        ON o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date
+    GROUP BY s.snapshot_date
 )
 SELECT
+    i.snapshot_date,
     i."Menu_item",
     i."Cuisine",
     i.total_orders,
     i.total_quantity_sold,
     i.total_revenue,
 
-    -- Popularity Index: % of total orders containing this item
+    -- Popularity Index: percent of total orders containing this item
     ROUND(
-        100.0 * i.total_orders / NULLIF((SELECT COUNT(DISTINCT "Order_id") FROM silver."orders"), 0),
+        100.0 * i.total_orders / NULLIF(t.total_orders, 0),
         2
     ) AS popularity_index,
 
-    -- Cuisine Revenue Share: Item’s revenue as % of its cuisine revenue
+    -- Cuisine Revenue Share: Item’s revenue as percent of its cuisine revenue
     ROUND(
         100.0 * i.total_revenue / NULLIF(c.cuisine_total_revenue, 0),
         2
@@ -119,28 +185,46 @@ SELECT
 
 FROM item_stats i
 JOIN cuisine_totals c
-    ON i."Cuisine" = c."Cuisine";
-            """,
+    ON i.snapshot_date = c.snapshot_date
+   AND i."Cuisine" = c."Cuisine"
+JOIN order_totals t
+    ON i.snapshot_date = t.snapshot_date
+""",
 
-            # 3. Customer Summary
-            """
-            CREATE TABLE IF NOT EXISTS gold.customer_summary AS
-WITH base AS (
+    # 3. Customer Summary
+    "customer_summary": """
+WITH snapshots AS (
+    SELECT UNNEST(%(snapshot_dates)s::date[]) AS snapshot_date
+),
+customer_orders AS (
     SELECT
+        "Customer_id",
+        "Order_date",
+        COUNT("Order_id") AS orders_count
+    FROM silver."orders"
+    GROUP BY "Customer_id", "Order_date"
+),
+base AS (
+    SELECT
+        s.snapshot_date,
         c."Customer_id",
         c."city",
         DATE_TRUNC('month', c."Signup_date") AS acquisition_month,
-        MIN(o."Order_date") AS first_order_date,
-        MAX(o."Order_date") AS last_order_date,
-        COUNT(o."Order_id") AS total_orders,
-        EXTRACT(DAY FROM (CURRENT_DATE - MAX(o."Order_date"))) AS days_since_last_order
+        MIN(co."Order_date") AS first_order_date,
+        MAX(co."Order_date") AS last_order_date,
+        COALESCE(SUM(co.orders_count), 0) AS total_orders,
+        EXTRACT(DAY FROM (s.snapshot_date - MAX(co."Order_date"))) AS days_since_last_order
     FROM silver."customers" c
-    LEFT JOIN silver."orders" o
-        ON c."Customer_id" = o."Customer_id"
-    GROUP BY c."Customer_id", c."city", acquisition_month
+    JOIN snapshots s
+        ON c."Signup_date" <= s.snapshot_date
+    LEFT JOIN customer_orders co
+        ON c."Customer_id" = co."Customer_id"
+       AND (co."Order_date" IS NULL OR co."Order_date"::date <= s.snapshot_date)
+    GROUP BY s.snapshot_date, c."Customer_id", c."city", acquisition_month
 ),
 monthly AS (
     SELECT
+        snapshot_date,
         acquisition_month,
         "city",
         COUNT(DISTINCT "Customer_id") AS new_customers,
@@ -149,144 +233,286 @@ monthly AS (
         COUNT(*) FILTER (WHERE days_since_last_order <= 30) AS active_customers,
         ROUND(AVG(EXTRACT(DAY FROM (last_order_date - first_order_date))), 2) AS avg_first_to_last_order_lag
     FROM base
-    GROUP BY acquisition_month, "city"
+    GROUP BY snapshot_date, acquisition_month, "city"
 )
 SELECT
+    snapshot_date,
     acquisition_month,
     "city",
-    SUM(new_customers) OVER (PARTITION BY "city" ORDER BY acquisition_month ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS total_customers,  -- cumulative
+    SUM(new_customers) OVER (PARTITION BY snapshot_date, "city" ORDER BY acquisition_month ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS total_customers,  -- cumulative
     new_customers,
     retention_rate_pct,
     dormant_customer_pct,
     active_customers,
     avg_first_to_last_order_lag
-FROM monthly;
-            """,
+FROM monthly
+""",
 
-            # 4. Restaurant Summary
-            """
-            CREATE TABLE IF NOT EXISTS gold.restaurant_summary AS
-WITH base AS (
+    # 4. Restaurant Summary
+    "restaurant_summary": """
+WITH snapshots AS (
+    SELECT UNNEST(%(snapshot_dates)s::date[]) AS snapshot_date
+),
+order_revenue AS (
+    SELECT
+        o."Order_id",
+        o."Restaurant_id",
+        o."Order_date"::date AS order_day,
+        SUM(oi."Quantity" * oi."Price") AS revenue
+    FROM silver."orders" o
+    LEFT JOIN silver."order_items" oi
+        ON o."Order_id" = oi."Order_id"
+    GROUP BY o."Order_id", o."Restaurant_id", o."Order_date"
+),
+base AS (
     SELECT
+        s.snapshot_date,
         r."Restaurant_id",
         r."city",
         DATE_TRUNC('month', r."Open_date") AS opening_month,
-        COUNT(DISTINCT o."Order_id") AS total_orders,
+        COUNT(DISTINCT rev."Order_id") AS total_orders,
         ROUND(AVG(r."Rating"),2) AS avg_rating,
-        SUM(oi."Quantity" * oi."Price") AS total_revenue
+        SUM(rev.revenue) AS total_revenue
     FROM silver."restaurants" r
-    LEFT JOIN silver."orders" o
-        ON r."Restaurant_id" = o."Restaurant_id"
-    LEFT JOIN silver."order_items" oi
-        ON o."Order_id" = oi."Order_id"
-    GROUP BY r."Restaurant_id", r."city", opening_month
+    JOIN snapshots s
+        ON r."Open_date" <= s.snapshot_date
+    LEFT JOIN order_revenue rev
+        ON r."Restaurant_id" = rev."Restaurant_id"
+       AND (rev.order_day IS NULL OR rev.order_day <= s.snapshot_date)
+    GROUP BY s.snapshot_date, r."Restaurant_id", r."city", opening_month
 ),
 monthly AS (
     SELECT
+        snapshot_date,
         opening_month,
         "city",
         COUNT(DISTINCT "Restaurant_id") AS new_restaurants,
         SUM(COALESCE(total_revenue,0) * COALESCE(avg_rating,0)) AS performance_score
     FROM base
-    GROUP BY opening_month, "city"
+    GROUP BY snapshot_date, opening_month, "city"
 ),
 cumulative AS (
     SELECT
+        m.snapshot_date,
         m.opening_month,
         m."city",
         m.new_restaurants,
         SUM(m.new_restaurants) OVER (
-            PARTITION BY m."city"
+            PARTITION BY m.snapshot_date, m."city"
             ORDER BY m.opening_month
             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
         ) AS total_restaurants,
         m.performance_score
     FROM monthly m
 )
-SELECT * FROM cumulative;
-            """,
+SELECT * FROM cumulative
+""",
 
-            # 5. Partner Summary
-            """
-            CREATE TABLE IF NOT EXISTS gold.partner_summary AS
-WITH base AS (
+    # 5. Partner Summary
+    "partner_summary": """
+WITH snapshots AS (
+    SELECT UNNEST(%(snapshot_dates)s::date[]) AS snapshot_date
+),
+base AS (
     SELECT
+        s.snapshot_date,
         p."Partner_id",
         p."Vehicle_type",
         p."Join_date",
         COUNT(DISTINCT o."Order_id") AS orders_delivered,
         ROUND(AVG(p."Rating"),2) AS avg_rating
     FROM silver."delivery_partners" p
+    JOIN snapshots s
+        ON p."Join_date" IS NULL OR p."Join_date" <= s.snapshot_date
     LEFT JOIN silver."orders" o
         ON p."Partner_id" = o."Partner_id"
-    GROUP BY p."Partner_id", p."Vehicle_type", p."Join_date"
+       AND (o."Order_date" IS NULL OR o."Order_date"::date <= s.snapshot_date)
+    GROUP BY s.snapshot_date, p."Partner_id", p."Vehicle_type", p."Join_date"
 ),
 
 vehicle_level AS (
     SELECT
+        snapshot_date,
         "Vehicle_type",
         COUNT(DISTINCT "Partner_id") AS total_partners,
         ROUND(AVG(orders_delivered),2) AS avg_orders_per_partner,
         ROUND(AVG(avg_rating),2) AS avg_partner_rating,
-        ROUND(100.0 * COUNT(*) FILTER (WHERE CURRENT_DATE - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate
+        ROUND(100.0 * COUNT(*) FILTER (WHERE snapshot_date - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate
     FROM base
-    GROUP BY "Vehicle_type"
+    GROUP BY snapshot_date, "Vehicle_type"
 ),
 
 overall AS (
     SELECT
+        snapshot_date,
         COUNT(DISTINCT "Partner_id") AS total_partners,
         ROUND(AVG(orders_delivered),2) AS avg_orders_per_partner,
         ROUND(AVG(avg_rating),2) AS avg_partner_rating_overall,
-        ROUND(100.0 * COUNT(*) FILTER (WHERE CURRENT_DATE - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate_overall
+        ROUND(100.0 * COUNT(*) FILTER (WHERE snapshot_date - "Join_date" > 180) / NULLIF(COUNT(*),0),2) AS partner_retention_rate_overall
     FROM base
+    GROUP BY snapshot_date
 )
 
 SELECT * FROM vehicle_level
 UNION ALL
 SELECT
+    snapshot_date,
     'ALL' AS "Vehicle_type",
     total_partners,
     avg_orders_per_partner,
     avg_partner_rating_overall,
     partner_retention_rate_overall
-FROM overall;
+FROM overall
+"""
+}
 
-            """
-        ]
+# -----------------------------
+# Create Gold tables if not exists
+# -----------------------------
+def ensure_gold_tables(conn):
+    """
+    Creates the snapshot-keyed Gold tables (empty) and their snapshot_date
+    indexes. Tables left over from the pre-snapshot layout are renamed to
+    <table>_pre_snapshot rather than dropped.
+    """
+    with conn.cursor() as cur:
+        cur.execute("CREATE SCHEMA IF NOT EXISTS gold;")
+        for table_name, select_sql in GOLD_TABLES.items():
+            cur.execute(
+                """
+                SELECT
+                    to_regclass(%s) IS NOT NULL,
+                    EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = 'gold'
+                          AND table_name = %s
+                          AND column_name = 'snapshot_date'
+                    )
+                """,
+                (f"gold.{table_name}", table_name)
+            )
+            table_exists, has_snapshot = cur.fetchone()
+            if table_exists and not has_snapshot:
+                logging.warning(f"gold.{table_name} has no snapshot_date; renaming to {table_name}_pre_snapshot")
+                cur.execute(f"ALTER TABLE gold.{table_name} RENAME TO {table_name}_pre_snapshot;")
 
-        for query in gold_queries:
-            cur.execute(query)
-            conn.commit()
+            cur.execute(
+                f"CREATE TABLE IF NOT EXISTS gold.{table_name} AS {select_sql} WITH NO DATA;",
+                {"snapshot_dates": []}
+            )
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_snapshot_date_idx "
+                f"ON gold.{table_name} (snapshot_date);"
+            )
+    conn.commit()
 
+# -----------------------------
+# Build Gold snapshots for a batch of dates
+# -----------------------------
+def build_gold_snapshots(conn, snapshot_dates):
+    """
+    snapshot_dates: list of datetime.date -> as-of dates to (re)build
+    Replaces any existing rows for those dates in a single transaction.
+    """
+    params = {"snapshot_dates": list(snapshot_dates)}
+    cur = conn.cursor()
+    try:
+        for table_name, select_sql in GOLD_TABLES.items():
+            cur.execute(
+                f"DELETE FROM gold.{table_name} WHERE snapshot_date = ANY(%(snapshot_dates)s::date[]);",
+                params
+            )
+            cur.execute(f"INSERT INTO gold.{table_name} {select_sql};", params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+# -----------------------------
+# Build Gold Layer
+# -----------------------------
+def build_gold(conn, as_of_date=None):
+    as_of_date = as_of_date or date.today()
+    try:
+        logging.info(f"Creating Gold tables as of {as_of_date}...")
+        ensure_gold_tables(conn)
+        build_gold_snapshots(conn, [as_of_date])
         logging.info("Gold layer tables created successfully!")
     except Exception as e:
         logging.error(f"Error creating Gold tables: {e}")
         conn.rollback()
+
+# -----------------------------
+# Historical Backfill
+# -----------------------------
+def _build_gold_batch(snapshot_dates):
+    conn = get_connection()
+    try:
+        build_gold_snapshots(conn, snapshot_dates)
     finally:
-        cur.close()
+        conn.close()
+
+def backfill_gold(start_date, end_date, workers=4, batch_size=31):
+    """
+    Rebuilds one Gold snapshot per day in [start_date, end_date].
+    Dates are grouped into batches of batch_size; each batch is one pass
+    over Silver, and up to `workers` batches run concurrently, each on its
+    own connection. Returns the list of batches that failed.
+    """
+    days = (end_date - start_date).days + 1
+    snapshot_dates = [start_date + timedelta(days=i) for i in range(days)]
+    batches = [snapshot_dates[i:i + batch_size] for i in range(0, len(snapshot_dates), batch_size)]
+
+    conn = get_connection()
+    try:
+        ensure_gold_tables(conn)
+    finally:
+        conn.close()
+
+    logging.info(f"Backfilling Gold from {start_date} to {end_date}: "
+                 f"{len(snapshot_dates)} snapshots in {len(batches)} batches, {workers} workers")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_build_gold_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                future.result()
+                logging.info(f"Gold snapshots {batch[0]}..{batch[-1]} built.")
+                print(f"Gold snapshots {batch[0]}..{batch[-1]} built")
+            except Exception as e:
+                logging.error(f"Error building Gold snapshots {batch[0]}..{batch[-1]}: {e}")
+                print(f"❌ Gold snapshots {batch[0]}..{batch[-1]} failed: {e}")
+                failed.append(batch)
+
+    logging.info(f"Backfill completed with {len(failed)} failed batches.")
+    return failed
 
 # -----------------------------
 # Reconciliation
 # -----------------------------
-def reconcile_gold(conn):
+def reconcile_gold(conn, as_of_date=None):
+    as_of_date = as_of_date or date.today()
     cur = conn.cursor()
     try:
-        logging.info("Starting reconciliation...")
+        logging.info(f"Starting reconciliation as of {as_of_date}...")
 
         reconciliation_queries = {
-            "total_orders": 'SELECT COUNT(*) FROM silver."orders"',
-            "gold_total_orders": 'SELECT COUNT(*) FROM gold.orders_summary',
-            "total_customers": 'SELECT COUNT(*) FROM silver."customers"',
-            "gold_total_customers": 'SELECT COUNT(*) FROM gold.customer_summary',
-            "total_restaurants": 'SELECT COUNT(*) FROM silver."restaurants"',
-            "gold_total_restaurants": 'SELECT COUNT(*) FROM gold.restaurant_summary',
-            "total_partners": 'SELECT COUNT(*) FROM silver."delivery_partners"',
-            "gold_total_partners": 'SELECT COUNT(*) FROM gold.partner_summary'
+            "total_orders": 'SELECT COUNT(*) FROM silver."orders" WHERE "Order_date" IS NULL OR "Order_date"::date <= %(as_of)s',
+            "gold_total_orders": 'SELECT COUNT(*) FROM gold.orders_summary WHERE snapshot_date = %(as_of)s',
+            "total_customers": 'SELECT COUNT(*) FROM silver."customers" WHERE "Signup_date" <= %(as_of)s',
+            "gold_total_customers": 'SELECT COUNT(*) FROM gold.customer_summary WHERE snapshot_date = %(as_of)s',
+            "total_restaurants": 'SELECT COUNT(*) FROM silver."restaurants" WHERE "Open_date" <= %(as_of)s',
+            "gold_total_restaurants": 'SELECT COUNT(*) FROM gold.restaurant_summary WHERE snapshot_date = %(as_of)s',
+            "total_partners": 'SELECT COUNT(*) FROM silver."delivery_partners" WHERE "Join_date" IS NULL OR "Join_date" <= %(as_of)s',
+            "gold_total_partners": 'SELECT COUNT(*) FROM gold.partner_summary WHERE snapshot_date = %(as_of)s'
         }
 
         for name, query in reconciliation_queries.items():
-            cur.execute(query)
+            cur.execute(query, {"as_of": as_of_date})
             result = cur.fetchone()[0]
             logging.info(f"{name}: {result}")
             print(f"{name}: {result}")
@@ -300,24 +526,41 @@ def reconcile_gold(conn):
 # -----------------------------
 # Day 3 Pipeline Orchestration
 # -----------------------------
-def run_day3_pipeline():
-    conn = psycopg2.connect(
-        dbname='mydb',
-        user='postgres',
-        password='Kalam5017',
-        host='localhost',
-        port='5432'
-    )
+def run_day3_pipeline(as_of_date=None):
+    as_of_date = as_of_date or date.today()
+    conn = get_connection()
 
-    print("=== Starting Day 3 ETL: Gold Layer ===")
-    build_gold(conn)
+    print(f"=== Starting Day 3 ETL: Gold Layer (as of {as_of_date}) ===")
+    build_gold(conn, as_of_date)
     print("=== Running Reconciliation ===")
-    reconcile_gold(conn)
+    reconcile_gold(conn, as_of_date)
     conn.close()
     print("=== Day 3 ETL Completed ===")
 
+def run_backfill(start_date, end_date, workers, batch_size):
+    print(f"=== Starting Gold Backfill: {start_date} to {end_date} ===")
+    failed = backfill_gold(start_date, end_date, workers, batch_size)
+    if failed:
+        print(f"=== Gold Backfill finished with {len(failed)} failed batches, see etl_day3.log ===")
+    else:
+        print("=== Gold Backfill Completed ===")
+
 # -----------------------------
 # Run if script is executed
 # -----------------------------
 if __name__ == "__main__":
-    run_day3_pipeline()
+    parser = argparse.ArgumentParser(description="Build the Gold layer from Silver.")
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="snapshot date for a single build, YYYY-MM-DD (default: today)")
+    parser.add_argument("--backfill", nargs=2, type=date.fromisoformat, metavar=("START", "END"),
+                        help="rebuild one snapshot per day from START to END inclusive")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="concurrent batches during backfill (default: 4)")
+    parser.add_argument("--batch-size", type=int, default=31,
+                        help="snapshot dates computed per pass over Silver (default: 31)")
+    args = parser.parse_args()
+
+    if args.backfill:
+        run_backfill(args.backfill[0], args.backfill[1], args.workers, args.batch_size)
+    else:
+        run_day3_pipeline(args.as_of)